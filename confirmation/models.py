@@ -3,8 +3,8 @@
 __revision__ = "$Id: models.py 28 2009-10-22 15:03:02Z jarek.zgoda $"
 import secrets
 from base64 import b32encode
-from collections.abc import Mapping
-from datetime import timedelta
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timedelta
 from typing import Optional, TypeAlias, Union, cast
 from urllib.parse import urljoin
 
@@ -157,15 +157,9 @@ def create_confirmation_object(
         realm = obj.realm
 
     current_time = timezone_now()
-    expiry_date = None
-    if not isinstance(validity_in_minutes, Unset):
-        if validity_in_minutes is None:
-            expiry_date = None
-        else:
-            assert validity_in_minutes is not None
-            expiry_date = current_time + timedelta(minutes=validity_in_minutes)
-    else:
-        expiry_date = current_time + timedelta(days=_properties[confirmation_type].validity_in_days)
+    expiry_date = get_confirmation_expiry_date(
+        current_time, confirmation_type, validity_in_minutes=validity_in_minutes
+    )
 
     return Confirmation.objects.create(
         content_object=obj,
@@ -177,6 +171,51 @@ def create_confirmation_object(
     )
 
 
+def create_confirmation_objects(
+    objs: Sequence[NoZilencerConfirmationObjT],
+    confirmation_type: int,
+    *,
+    validity_in_minutes: int | None | Unset = UNSET,
+) -> list["Confirmation"]:
+    # Bulk version of create_confirmation_object, for objects associated
+    # with a realm on this server; all the rows are created with a
+    # single INSERT.
+    current_time = timezone_now()
+    expiry_date = get_confirmation_expiry_date(
+        current_time, confirmation_type, validity_in_minutes=validity_in_minutes
+    )
+
+    confirmations = []
+    for obj in objs:
+        assert not isinstance(obj, PreregistrationRealm)
+        confirmations.append(
+            Confirmation(
+                content_object=obj,
+                date_sent=current_time,
+                confirmation_key=generate_key(),
+                realm=obj.realm,
+                expiry_date=expiry_date,
+                type=confirmation_type,
+            )
+        )
+    return Confirmation.objects.bulk_create(confirmations)
+
+
+def get_confirmation_expiry_date(
+    current_time: datetime,
+    confirmation_type: int,
+    *,
+    validity_in_minutes: int | None | Unset = UNSET,
+) -> datetime | None:
+    # validity_in_minutes is an override for the default values which are
+    # determined by the confirmation_type.
+    if isinstance(validity_in_minutes, Unset):
+        return current_time + timedelta(days=_properties[confirmation_type].validity_in_days)
+    if validity_in_minutes is None:
+        return None
+    return current_time + timedelta(minutes=validity_in_minutes)
+
+
 def create_confirmation_link(
     obj: ConfirmationObjT,
     confirmation_type: int,
@@ -18,7 +18,7 @@ from confirmation.models import (
     Confirmation,
     confirmation_url_for,
     create_confirmation_link,
-    create_confirmation_object,
+    create_confirmation_objects,
 )
 from zerver.context_processors import common_context
 from zerver.lib.email_validation import (
@@ -276,25 +276,41 @@ def do_invite_users(
 
     # Now that we are past all the possible errors, we actually create
     # the PreregistrationUser objects and trigger the email invitations.
-    for email in validated_emails:
-        # The logged in user is the referrer.
-        prereg_user = PreregistrationUser(
+    # The rows, and their stream and group memberships, are inserted in
+    # bulk, so that the query count does not scale with the number of
+    # invitees.
+    prereg_users = PreregistrationUser.objects.bulk_create(
+        PreregistrationUser(
             email=email,
+            # The logged in user is the referrer.
             referred_by=user_profile,
             invited_as=invite_as,
             realm=realm,
             include_realm_default_subscriptions=include_realm_default_subscriptions,
             notify_referrer_on_join=notify_referrer_on_join,
         )
-        prereg_user.save()
-        stream_ids = [stream.id for stream in streams]
-        prereg_user.streams.set(stream_ids)
-        groups_ids = [user_group.id for user_group in user_groups]
-        prereg_user.groups.set(groups_ids)
-
-        confirmation = create_confirmation_object(
-            prereg_user, Confirmation.INVITATION, validity_in_minutes=invite_expires_in_minutes
-        )
+        for email in validated_emails
+    )
+
+    stream_ids = {stream.id for stream in streams}
+    PreregistrationUserStream = PreregistrationUser.streams.through
+    PreregistrationUserStream.objects.bulk_create(
+        PreregistrationUserStream(preregistrationuser_id=prereg_user.id, stream_id=stream_id)
+        for prereg_user in prereg_users
+        for stream_id in stream_ids
+    )
+    group_ids = {user_group.id for user_group in user_groups}
+    PreregistrationUserGroup = PreregistrationUser.groups.through
+    PreregistrationUserGroup.objects.bulk_create(
+        PreregistrationUserGroup(preregistrationuser_id=prereg_user.id, namedusergroup_id=group_id)
+        for prereg_user in prereg_users
+        for group_id in group_ids
+    )
+
+    confirmations = create_confirmation_objects(
+        prereg_users, Confirmation.INVITATION, validity_in_minutes=invite_expires_in_minutes
+    )
+    for prereg_user, confirmation in zip(prereg_users, confirmations, strict=True):
         do_send_user_invite_email(
             prereg_user,
             confirmation=confirmation,
@@ -330,14 +346,19 @@ def do_get_invites_controlled_by_user(user_profile: UserProfile) -> list[dict[st
 
     invites = []
 
+    # Only load the columns that go into the returned dicts.
+    prereg_users = prereg_users.only(
+        "email", "referred_by", "invited_at", "invited_as", "notify_referrer_on_join"
+    ).prefetch_related("confirmation")
     for invitee in prereg_users:
-        assert invitee.referred_by is not None
+        assert invitee.referred_by_id is not None
+        (confirmation_obj,) = invitee.confirmation.all()
         invites.append(
             dict(
                 email=invitee.email,
-                invited_by_user_id=invitee.referred_by.id,
+                invited_by_user_id=invitee.referred_by_id,
                 invited=datetime_to_timestamp(invitee.invited_at),
-                expiry_date=get_invitation_expiry_date(invitee.confirmation.get()),
+                expiry_date=get_invitation_expiry_date(confirmation_obj),
                 id=invitee.id,
                 invited_as=invitee.invited_as,
                 is_multiuse=False,
@@ -358,7 +379,9 @@ def do_get_invites_controlled_by_user(user_profile: UserProfile) -> list[dict[st
             object_id__in=multiuse_invite_ids,
         ).filter(Q(expiry_date__gte=timezone_now()) | Q(expiry_date=None))
 
-    for confirmation_obj in multiuse_confirmation_objs:
+    for confirmation_obj in multiuse_confirmation_objs.select_related("realm").prefetch_related(
+        "content_object"
+    ):
         invite = confirmation_obj.content_object
         assert invite is not None
 
@@ -367,7 +390,7 @@ def do_get_invites_controlled_by_user(user_profile: UserProfile) -> list[dict[st
         assert invite.status != confirmation_settings.STATUS_REVOKED
         invites.append(
             dict(
-                invited_by_user_id=invite.referred_by.id,
+                invited_by_user_id=invite.referred_by_id,
                 invited=datetime_to_timestamp(confirmation_obj.date_sent),
                 expiry_date=get_invitation_expiry_date(confirmation_obj),
                 id=invite.id,
@@ -292,6 +292,7 @@ def send_immediate_email(
         print(mail.message().get_payload()[0])
         return
 
+    reusing_connection = connection is not None
     if connection is None:
         connection = get_connection()
 
@@ -322,6 +323,10 @@ def send_immediate_email(
         )
         raise EmailNotDeliveredError
     except smtplib.SMTPException as e:
+        if reusing_connection and isinstance(e, smtplib.SMTPServerDisconnected):
+            # The server closed the caller's long-lived connection;
+            # the caller is responsible for reconnecting.
+            raise
         logger.exception("Error sending %s email to %s: %s", template, mail.to, e, stack_info=True)
         raise EmailNotDeliveredError
 
@@ -451,28 +456,31 @@ def send_future_email(
         return
 
     assert (to_user_ids is None) ^ (to_emails is None)
+
+    # We store the recipients in the ScheduledEmail object itself,
+    # rather than the JSON data object, so that we can find and clear
+    # them using clear_scheduled_emails.  A single address is stored
+    # directly on the row, so it is set as part of the INSERT.
+    address = None
+    if to_emails is not None:
+        assert len(to_emails) == 1
+        address = parseaddr(to_emails[0])[1]
+
     with transaction.atomic(savepoint=False):
         email = ScheduledEmail.objects.create(
             type=EMAIL_TYPES[template_name],
             scheduled_timestamp=timezone_now() + delay,
             realm=realm,
             data=orjson.dumps(email_fields).decode(),
+            address=address,
         )
 
-        # We store the recipients in the ScheduledEmail object itself,
-        # rather than the JSON data object, so that we can find and clear
-        # them using clear_scheduled_emails.
-        try:
-            if to_user_ids is not None:
+        if to_user_ids is not None:
+            try:
                 email.users.add(*to_user_ids)
-            else:
-                assert to_emails is not None
-                assert len(to_emails) == 1
-                email.address = parseaddr(to_emails[0])[1]
-                email.save()
-        except Exception as e:
-            email.delete()
-            raise e
+            except Exception as e:
+                email.delete()
+                raise e
 
 
 def send_email_to_admins(
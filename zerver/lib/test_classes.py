@@ -18,6 +18,7 @@ import orjson
 import responses
 from django.apps import apps
 from django.conf import settings
+from django.core import mail
 from django.core.files.uploadedfile import UploadedFile
 from django.core.mail import EmailMessage
 from django.core.signals import got_request_exception
@@ -974,12 +975,10 @@ Output:
         email_subject_contains: str | None = None,
         email_body_contains: str | None = None,
     ) -> str:
-        from django.core.mail import outbox
-
         if url_pattern is None:
             # This is a bit of a crude heuristic, but good enough for most tests.
             url_pattern = settings.EXTERNAL_HOST + r"(\S+)>"
-        for message in reversed(outbox):
+        for message in reversed(mail.outbox):
             if any(
                 addr == email_address or addr.endswith(f" <{email_address}>") for addr in message.to
             ):
@@ -19,6 +19,7 @@ import ldap
 import orjson
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.core import mail
 from django.db.migrations.state import StateApps
 from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
 from django.http.request import QueryDict
@@ -296,19 +297,37 @@ def make_client(name: str) -> Client:
     return client
 
 
-def find_key_by_email(address: str) -> str | None:
-    from django.core.mail import outbox
+CONFIRMATION_KEY_REGEX = re.compile(r"accounts/do_confirm/([a-z0-9]{24})>")
+
 
-    key_regex = re.compile(r"accounts/do_confirm/([a-z0-9]{24})>")
-    for message in reversed(outbox):
+def find_key_by_email(address: str) -> str | None:
+    for message in reversed(mail.outbox):
         if address in message.to:
-            match = key_regex.search(str(message.body))
+            match = CONFIRMATION_KEY_REGEX.search(str(message.body))
             assert match is not None
             [key] = match.groups()
             return key
     return None  # nocoverage -- in theory a test might want this case, but none do
 
 
+def find_keys_by_emails(addresses: Iterable[str]) -> dict[str, str]:
+    """Like find_key_by_email, but looks up the confirmation keys for
+    several addresses in a single pass over the outbox.  Addresses
+    which were not sent an email are missing from the result."""
+    wanted_addresses = set(addresses)
+    keys: dict[str, str] = {}
+    # Later emails overwrite earlier ones, so the most recent key for
+    # each address wins, as in find_key_by_email.
+    for message in mail.outbox:
+        recipients = wanted_addresses.intersection(message.to)
+        if recipients:
+            match = CONFIRMATION_KEY_REGEX.search(str(message.body))
+            assert match is not None
+            [key] = match.groups()
+            keys.update(dict.fromkeys(recipients, key))
+    return keys
+
+
 def message_stream_count(user_profile: UserProfile) -> int:
     return UserMessage.objects.select_related("message").filter(user_profile=user_profile).count()
 
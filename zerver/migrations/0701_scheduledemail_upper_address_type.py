@@ -0,0 +1,22 @@
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("zerver", "0700_fix_user_role_system_groups"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="scheduledemail",
+            index=models.Index(
+                django.db.models.functions.text.Upper("address"),
+                models.F("type"),
+                name="zerver_scheduledemail_upper_address_type",
+            ),
+        ),
+    ]
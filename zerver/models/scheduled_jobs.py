@@ -3,6 +3,7 @@ from typing import TypedDict
 from django.conf import settings
 from django.db import models
 from django.db.models import CASCADE, Q
+from django.db.models.functions import Upper
 from django.utils.timezone import now as timezone_now
 from typing_extensions import override
 
@@ -44,6 +45,18 @@ class ScheduledEmail(AbstractScheduledJob):
     INVITATION_REMINDER = 3
     type = models.PositiveSmallIntegerField()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                # For clearing the invitation reminders scheduled for
+                # an email address, which is matched
+                # case-insensitively.
+                Upper("address"),
+                "type",
+                name="zerver_scheduledemail_upper_address_type",
+            ),
+        ]
+
     @override
     def __str__(self) -> str:
         return f"{self.type} {self.address or list(self.users.all())} {self.scheduled_timestamp}"
@@ -52,7 +52,7 @@ from zerver.lib.default_streams import get_slim_realm_default_streams
 from zerver.lib.send_email import queue_scheduled_emails
 from zerver.lib.streams import ensure_stream
 from zerver.lib.test_classes import ZulipTestCase
-from zerver.lib.test_helpers import find_key_by_email
+from zerver.lib.test_helpers import find_key_by_email, find_keys_by_emails
 from zerver.lib.user_groups import get_direct_user_groups, is_user_in_group
 from zerver.models import (
     DefaultStream,
@@ -63,12 +63,13 @@ from zerver.models import (
     Realm,
     ScheduledEmail,
     Stream,
+    UserGroup,
     UserMessage,
     UserProfile,
 )
 from zerver.models.groups import SystemGroups
 from zerver.models.realms import get_realm
-from zerver.models.streams import get_stream
+from zerver.models.streams import bulk_get_streams, get_stream
 from zerver.models.users import get_user_by_delivery_email
 from zerver.views.invite import INVITATION_LINK_VALIDITY_MINUTES, get_invitee_emails_set
 from zerver.views.registration import accounts_home
@@ -77,6 +78,19 @@ if TYPE_CHECKING:
     from django.test.client import _MonkeyPatchedWSGIResponse as TestHttpResponse
 
 
+# The two-day expiry most of these tests give their invitations.
+INVITE_EXPIRES_IN_MINUTES = 2 * 24 * 60
+
+
+def get_streams_by_name(realm: Realm, stream_names: list[str]) -> list[Stream]:
+    # Fetches the named channels with a single query; names match
+    # case-insensitively, as with get_stream.
+    streams_by_name = bulk_get_streams(realm, set(stream_names))
+    missing_names = [name for name in stream_names if name.lower() not in streams_by_name]
+    assert not missing_names, f"No such channels: {missing_names}"
+    return [streams_by_name[name.lower()] for name in stream_names]
+
+
 class StreamSetupTest(ZulipTestCase):
     def add_messages_to_stream(self, stream_name: str) -> None:
         # Make sure that add_new_user_history has some messages
@@ -186,22 +200,42 @@ class StreamSetupTest(ZulipTestCase):
 
 
 class InviteUserBase(ZulipTestCase):
+    TOKENIZED_NOREPLY_DISPLAY_FROM_RE = re.compile(rf" <{ZulipTestCase.TOKENIZED_NOREPLY_REGEX}>\Z")
+
+    @override
+    def setUp(self) -> None:
+        super().setUp()
+        # Maps (realm ID, channel name) to the channel's ID.  This is
+        # only safe to reuse within a single test, since channels
+        # created by a test get a different ID each time.
+        self.stream_id_cache: dict[tuple[int | None, str], int] = {}
+
+    def get_cached_stream_id(self, name: str, realm: Realm | None = None) -> int:
+        key = (realm.id if realm else None, name)
+        if key not in self.stream_id_cache:
+            stream_id = self.get_stream_id(name, realm=realm)
+            if stream_id == self.INVALID_STREAM_ID:
+                return stream_id
+            self.stream_id_cache[key] = stream_id
+        return self.stream_id_cache[key]
+
     def check_sent_emails(self, correct_recipients: list[str], clear: bool = False) -> None:
         self.assert_length(mail.outbox, len(correct_recipients))
-        email_recipients = [email.recipients()[0] for email in mail.outbox]
-        self.assertEqual(sorted(email_recipients), sorted(correct_recipients))
+        self.assertCountEqual((email.to[0] for email in mail.outbox), correct_recipients)
         if len(mail.outbox) == 0:
             return
 
-        self.assertIn("Zulip", self.email_display_from(mail.outbox[0]))
+        display_from = self.email_display_from(mail.outbox[0])
+        self.assertIn("Zulip", display_from)
 
         self.assertEqual(self.email_envelope_from(mail.outbox[0]), settings.NOREPLY_EMAIL_ADDRESS)
-        self.assertRegex(
-            self.email_display_from(mail.outbox[0]), rf" <{self.TOKENIZED_NOREPLY_REGEX}>\Z"
-        )
+        self.assertRegex(display_from, self.TOKENIZED_NOREPLY_DISPLAY_FROM_RE)
 
         if clear:
-            mail.outbox = []
+            mail.outbox.clear()
+
+    def get_key_from_confirmation_url(self, url: str) -> str:
+        return url.rpartition("/")[2]
 
     def invite(
         self,
@@ -225,11 +259,13 @@ class InviteUserBase(ZulipTestCase):
 
         group_ids should be a list of int.
         """
-        stream_ids = [self.get_stream_id(stream_name, realm=realm) for stream_name in stream_names]
+        stream_ids = [
+            self.get_cached_stream_id(stream_name, realm=realm) for stream_name in stream_names
+        ]
 
-        invite_expires_in: str | int | None = invite_expires_in_minutes
-        if invite_expires_in is None:
-            invite_expires_in = orjson.dumps(None).decode()
+        invite_expires_in: str | int = (
+            "null" if invite_expires_in_minutes is None else invite_expires_in_minutes
+        )
 
         with self.captureOnCommitCallbacks(execute=True):
             return self.client_post(
@@ -653,7 +689,9 @@ class InviteUserTest(InviteUserBase):
         result = self.invite(mirror_user.email, ["Denmark"])
         self.assert_json_success(result)
 
-        prereg_user = PreregistrationUser.objects.get(email=mirror_user.email)
+        prereg_user = PreregistrationUser.objects.select_related("referred_by").get(
+            email=mirror_user.email
+        )
         assert prereg_user.referred_by is not None and inviter is not None
         self.assertEqual(
             prereg_user.referred_by.email,
@@ -948,8 +986,7 @@ class InviteUserTest(InviteUserBase):
         email2 = "bob-test@zulip.com"
         invitee = f"Alice Test <{email}>, {email2}"
         self.assert_json_success(self.invite(invitee, ["Denmark"]))
-        self.assertTrue(find_key_by_email(email))
-        self.assertTrue(find_key_by_email(email2))
+        self.assertEqual(find_keys_by_emails([email, email2]).keys(), {email, email2})
         self.check_sent_emails([email, email2])
 
     def test_successful_invite_users_with_specified_streams(self) -> None:
@@ -1083,49 +1120,37 @@ class InviteUserTest(InviteUserBase):
             {"test1", "test2", SystemGroups.MEMBERS, SystemGroups.FULL_MEMBERS},
         )
 
-    def test_invite_others_to_realm_setting(self) -> None:
-        """
-        The `can_invite_users_group` realm setting works properly.
-        """
-        realm = get_realm("zulip")
-
-        administrators_system_group = NamedUserGroup.objects.get(
-            name=SystemGroups.ADMINISTRATORS, realm=realm, is_system_group=True
-        )
-        moderators_system_group = NamedUserGroup.objects.get(
-            name=SystemGroups.MODERATORS, realm=realm, is_system_group=True
-        )
-        full_members_system_group = NamedUserGroup.objects.get(
-            name=SystemGroups.FULL_MEMBERS, realm=realm, is_system_group=True
-        )
-        members_system_group = NamedUserGroup.objects.get(
-            name=SystemGroups.MEMBERS, realm=realm, is_system_group=True
-        )
-        nobody_system_group = NamedUserGroup.objects.get(
-            name=SystemGroups.NOBODY, realm=realm, is_system_group=True
-        )
-
+    def set_can_invite_users_group(self, user_group: UserGroup) -> None:
         do_change_realm_permission_group_setting(
-            realm,
+            get_realm("zulip"),
             "can_invite_users_group",
-            nobody_system_group,
+            user_group,
             acting_user=None,
         )
+
+    def set_can_invite_users_system_group(self, group_name: str) -> None:
+        self.set_can_invite_users_group(
+            NamedUserGroup.objects.get(
+                name=group_name, realm=get_realm("zulip"), is_system_group=True
+            )
+        )
+
+    # The following tests check that the `can_invite_users_group`
+    # realm setting works properly, for various values of it.
+    def test_invite_others_to_realm_setting_nobody(self) -> None:
+        self.set_can_invite_users_system_group(SystemGroups.NOBODY)
         self.login("desdemona")
-        email = "alice-test@zulip.com"
-        email2 = "bob-test@zulip.com"
-        invitee = f"Alice Test <{email}>, {email2}"
+        invitee = "Alice Test <alice-test@zulip.com>, bob-test@zulip.com"
         self.assert_json_error(
             self.invite(invitee, ["Denmark"]),
             "Insufficient permission",
         )
 
-        do_change_realm_permission_group_setting(
-            realm,
-            "can_invite_users_group",
-            administrators_system_group,
-            acting_user=None,
-        )
+    def test_invite_others_to_realm_setting_administrators(self) -> None:
+        self.set_can_invite_users_system_group(SystemGroups.ADMINISTRATORS)
+        email = "alice-test@zulip.com"
+        email2 = "bob-test@zulip.com"
+        invitee = f"Alice Test <{email}>, {email2}"
 
         self.login("shiva")
         self.assert_json_error(
@@ -1136,23 +1161,16 @@ class InviteUserTest(InviteUserBase):
         # Now verify an administrator can do it
         self.login("iago")
         self.assert_json_success(self.invite(invitee, ["Denmark"]))
-        self.assertTrue(find_key_by_email(email))
-        self.assertTrue(find_key_by_email(email2))
-
+        self.assertEqual(find_keys_by_emails([email, email2]).keys(), {email, email2})
         self.check_sent_emails([email, email2])
 
-        mail.outbox = []
-
-        do_change_realm_permission_group_setting(
-            realm,
-            "can_invite_users_group",
-            moderators_system_group,
-            acting_user=None,
-        )
-        self.login("hamlet")
+    def test_invite_others_to_realm_setting_moderators(self) -> None:
+        self.set_can_invite_users_system_group(SystemGroups.MODERATORS)
         email = "carol-test@zulip.com"
         email2 = "earl-test@zulip.com"
         invitee = f"Carol Test <{email}>, {email2}"
+
+        self.login("hamlet")
         self.assert_json_error(
             self.invite(invitee, ["Denmark"]),
             "Insufficient permission",
@@ -1160,42 +1178,30 @@ class InviteUserTest(InviteUserBase):
 
         self.login("shiva")
         self.assert_json_success(self.invite(invitee, ["Denmark"]))
-        self.assertTrue(find_key_by_email(email))
-        self.assertTrue(find_key_by_email(email2))
+        self.assertEqual(find_keys_by_emails([email, email2]).keys(), {email, email2})
         self.check_sent_emails([email, email2])
 
-        mail.outbox = []
-
-        do_change_realm_permission_group_setting(
-            realm,
-            "can_invite_users_group",
-            members_system_group,
-            acting_user=None,
-        )
-
-        self.login("polonius")
+    def test_invite_others_to_realm_setting_members(self) -> None:
+        self.set_can_invite_users_system_group(SystemGroups.MEMBERS)
         email = "dave-test@zulip.com"
         email2 = "mark-test@zulip.com"
         invitee = f"Dave Test <{email}>, {email2}"
+
+        self.login("polonius")
         self.assert_json_error(self.invite(invitee, ["Denmark"]), "Not allowed for guest users")
 
         self.login("hamlet")
         self.assert_json_success(self.invite(invitee, ["Denmark"]))
-        self.assertTrue(find_key_by_email(email))
-        self.assertTrue(find_key_by_email(email2))
+        self.assertEqual(find_keys_by_emails([email, email2]).keys(), {email, email2})
         self.check_sent_emails([email, email2])
 
-        mail.outbox = []
-
-        do_change_realm_permission_group_setting(
-            realm,
-            "can_invite_users_group",
-            full_members_system_group,
-            acting_user=None,
-        )
+    def test_invite_others_to_realm_setting_full_members(self) -> None:
+        realm = get_realm("zulip")
+        self.set_can_invite_users_system_group(SystemGroups.FULL_MEMBERS)
 
         hamlet = self.example_user("hamlet")
         hamlet.date_joined = timezone_now() - timedelta(days=9)
+        self.login_user(hamlet)
 
         do_set_realm_property(realm, "waiting_period_threshold", 10, acting_user=None)
 
@@ -1210,19 +1216,19 @@ class InviteUserTest(InviteUserBase):
         do_set_realm_property(realm, "waiting_period_threshold", 0, acting_user=None)
 
         self.assert_json_success(self.invite(invitee, ["Denmark"]))
-        self.assertTrue(find_key_by_email(email))
-        self.assertTrue(find_key_by_email(email2))
+        self.assertEqual(find_keys_by_emails([email, email2]).keys(), {email, email2})
         self.check_sent_emails([email, email2])
 
+    def test_invite_others_to_realm_setting_user_group(self) -> None:
+        hamlet = self.example_user("hamlet")
         cordelia = self.example_user("cordelia")
+        invitee = "Issac Test <issac-test@zulip.com>, steven-test@zulip.com"
 
         # Test for checking setting for non-system user group.
         user_group = check_add_user_group(
-            realm, "new_group", [hamlet, cordelia], acting_user=hamlet
-        )
-        do_change_realm_permission_group_setting(
-            realm, "can_invite_users_group", user_group, acting_user=None
+            get_realm("zulip"), "new_group", [hamlet, cordelia], acting_user=hamlet
         )
+        self.set_can_invite_users_group(user_group)
 
         # Hamlet and Cordelia are in the allowed user group, so can send email
         # invitations.
@@ -1239,17 +1245,19 @@ class InviteUserTest(InviteUserBase):
             "Insufficient permission",
         )
 
+    def test_invite_others_to_realm_setting_anonymous_group(self) -> None:
+        invitee = "Issac Test <issac-test@zulip.com>, steven-test@zulip.com"
+
         # Test for checking the setting for anonymous user group.
         anonymous_user_group = self.create_or_update_anonymous_group_for_setting(
-            [hamlet],
-            [administrators_system_group],
-        )
-        do_change_realm_permission_group_setting(
-            realm,
-            "can_invite_users_group",
-            anonymous_user_group,
-            acting_user=None,
+            [self.example_user("hamlet")],
+            [
+                NamedUserGroup.objects.get(
+                    name=SystemGroups.ADMINISTRATORS, realm=get_realm("zulip"), is_system_group=True
+                )
+            ],
         )
+        self.set_can_invite_users_group(anonymous_user_group)
 
         # Hamlet is the direct member of the anonymous user group, so can send
         # email invitations.
@@ -1283,13 +1291,13 @@ class InviteUserTest(InviteUserBase):
         self.make_stream(private_stream_name, invite_only=True)
         self.subscribe(user_profile, private_stream_name)
         public_msg_id = self.send_stream_message(
-            self.example_user("hamlet"),
+            user_profile,
             "Denmark",
             topic_name="Public topic",
             content="Public message",
         )
         secret_msg_id = self.send_stream_message(
-            self.example_user("hamlet"),
+            user_profile,
             private_stream_name,
             topic_name="Secret topic",
             content="Secret message",
@@ -1307,9 +1315,9 @@ class InviteUserTest(InviteUserBase):
         self.assertFalse(secret_msg_id in invitee_msg_ids)
         self.assertFalse(invitee_profile.is_realm_admin)
 
-        invitee_msg, signups_stream_msg, inviter_msg, secret_msg = Message.objects.all().order_by(
-            "-id"
-        )[0:4]
+        invitee_msg, signups_stream_msg, inviter_msg, secret_msg = (
+            Message.objects.filter(realm_id=realm.id).select_related("sender").order_by("-id")[0:4]
+        )
 
         self.assertEqual(secret_msg.id, secret_msg_id)
 
@@ -1347,16 +1355,9 @@ earl-test@zulip.com""",
                 ["Denmark"],
             )
         )
-        for user in ("bob", "carol", "dave", "earl"):
-            self.assertTrue(find_key_by_email(f"{user}-test@zulip.com"))
-        self.check_sent_emails(
-            [
-                "bob-test@zulip.com",
-                "carol-test@zulip.com",
-                "dave-test@zulip.com",
-                "earl-test@zulip.com",
-            ]
-        )
+        invitees = [f"{user}-test@zulip.com" for user in ("bob", "carol", "dave", "earl")]
+        self.assertEqual(find_keys_by_emails(invitees).keys(), set(invitees))
+        self.check_sent_emails(invitees)
 
     def test_direct_notification_for_accepted_invitation(self) -> None:
         """
@@ -1480,9 +1481,10 @@ earl-test@zulip.com""",
         )
         self.check_sent_emails([])
 
+    WHITESPACE_RE = re.compile(r"\s+")
+
     def normalize_string(self, s: str) -> str:
-        s = s.strip()
-        return re.sub(r"\s+", " ", s)
+        return self.WHITESPACE_RE.sub(" ", s.strip())
 
     def test_invite_links_in_name(self) -> None:
         """
@@ -1529,11 +1531,12 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         )
 
         # We only created accounts for the new users.
-        for email in existing:
-            with self.assertRaises(PreregistrationUser.DoesNotExist):
-                PreregistrationUser.objects.get(email=email)
-        for email in new:
-            self.assertTrue(PreregistrationUser.objects.get(email=email))
+        self.assertCountEqual(
+            PreregistrationUser.objects.filter(email__in=existing + new).values_list(
+                "email", flat=True
+            ),
+            new,
+        )
 
         # We only sent emails to the new users.
         self.check_sent_emails(new)
@@ -1545,7 +1548,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         """
         zulip_realm = get_realm("zulip")
         zulip_realm.emails_restricted_to_domains = True
-        zulip_realm.save()
+        zulip_realm.save(update_fields=["emails_restricted_to_domains"])
 
         self.login("hamlet")
         external_address = "foo@example.com"
@@ -1563,7 +1566,9 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         zulip_realm = get_realm("zulip")
         zulip_realm.emails_restricted_to_domains = False
         zulip_realm.disallow_disposable_email_addresses = True
-        zulip_realm.save()
+        zulip_realm.save(
+            update_fields=["emails_restricted_to_domains", "disallow_disposable_email_addresses"]
+        )
 
         self.login("hamlet")
         external_address = "foo@mailnator.com"
@@ -1580,7 +1585,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         """
         zulip_realm = get_realm("zulip")
         zulip_realm.emails_restricted_to_domains = False
-        zulip_realm.save()
+        zulip_realm.save(update_fields=["emails_restricted_to_domains"])
 
         self.login("hamlet")
         external_address = "foo@example.com"
@@ -1597,7 +1602,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         """
         zulip_realm = get_realm("zulip")
         zulip_realm.emails_restricted_to_domains = False
-        zulip_realm.save()
+        zulip_realm.save(update_fields=["emails_restricted_to_domains"])
 
         self.login("hamlet")
         external_address = "foo@example.com"
@@ -1606,7 +1611,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         self.check_sent_emails([external_address])
 
         zulip_realm.emails_restricted_to_domains = True
-        zulip_realm.save()
+        zulip_realm.save(update_fields=["emails_restricted_to_domains"])
 
         result = self.submit_reg_form_for_user("foo@example.com", "password")
         self.assertEqual(result.status_code, 400)
@@ -1624,7 +1629,9 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         zulip_realm = get_realm("zulip")
         zulip_realm.emails_restricted_to_domains = False
         zulip_realm.disallow_disposable_email_addresses = False
-        zulip_realm.save()
+        zulip_realm.save(
+            update_fields=["emails_restricted_to_domains", "disallow_disposable_email_addresses"]
+        )
 
         self.login("hamlet")
         external_address = "foo@mailnator.com"
@@ -1633,7 +1640,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         self.check_sent_emails([external_address])
 
         zulip_realm.disallow_disposable_email_addresses = True
-        zulip_realm.save()
+        zulip_realm.save(update_fields=["disallow_disposable_email_addresses"])
 
         result = self.submit_reg_form_for_user("foo@mailnator.com", "password")
         self.assertEqual(result.status_code, 400)
@@ -1650,7 +1657,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         """
         zulip_realm = get_realm("zulip")
         zulip_realm.emails_restricted_to_domains = False
-        zulip_realm.save()
+        zulip_realm.save(update_fields=["emails_restricted_to_domains"])
 
         self.login("hamlet")
         external_address = "foo+label@zulip.com"
@@ -1659,7 +1666,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         self.check_sent_emails([external_address])
 
         zulip_realm.emails_restricted_to_domains = True
-        zulip_realm.save()
+        zulip_realm.save(update_fields=["emails_restricted_to_domains"])
 
         result = self.submit_reg_form_for_user(external_address, "password")
         self.assertEqual(result.status_code, 400)
@@ -1675,7 +1682,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         prereg_user = obj.content_object
         assert prereg_user is not None
         prereg_user.email = "invalid.email"
-        prereg_user.save()
+        prereg_user.save(update_fields=["email"])
 
         result = self.submit_reg_form_for_user(email, "password")
         self.assertEqual(result.status_code, 400)
@@ -1742,8 +1749,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         )
         result = self.invite(invitee, stream_names)
         self.assert_json_success(result)
-        self.check_sent_emails([invitee])
-        mail.outbox.pop()
+        self.check_sent_emails([invitee], clear=True)
 
         # User will be subscribed to default streams even when the
         # referrer does not have permission to subscribe others.
@@ -1775,8 +1781,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         invitee = self.nonreg_email("bob")
         result = self.invite(invitee, stream_names)
         self.assert_json_success(result)
-        self.check_sent_emails([invitee])
-        mail.outbox.pop()
+        self.check_sent_emails([invitee], clear=True)
 
         do_change_realm_permission_group_setting(
             realm, "can_add_subscribers_group", members_group, acting_user=None
@@ -1785,8 +1790,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         invitee = self.nonreg_email("test")
         result = self.invite(invitee, stream_names)
         self.assert_json_success(result)
-        self.check_sent_emails([invitee])
-        mail.outbox.pop()
+        self.check_sent_emails([invitee], clear=True)
 
         invitee = self.nonreg_email("test1")
         result = self.invite(invitee, [], include_realm_default_subscriptions=True)
@@ -1811,7 +1815,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         email_jobs_to_deliver = ScheduledEmail.objects.all()
         self.assert_length(email_jobs_to_deliver, 1)
 
-        mail.outbox = []
+        mail.outbox.clear()
         for job in email_jobs_to_deliver:
             with self.captureOnCommitCallbacks(execute=True):
                 queue_scheduled_emails(job)
@@ -1819,7 +1823,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         self.assertEqual(self.email_envelope_from(mail.outbox[0]), settings.NOREPLY_EMAIL_ADDRESS)
 
         # Now verify that signing up clears invite_reminder emails
-        mail.outbox = []
+        mail.outbox.clear()
         invitee_email = self.nonreg_email("bob")
         self.assert_json_success(self.invite(invitee_email, ["Denmark"]))
         self.assertTrue(find_key_by_email(invitee_email))
@@ -1848,11 +1852,10 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         )
         # Check invitation reminder email is not scheduled with 3 day link expiry
         self.invite("bob@zulip.com", ["Denmark"], invite_expires_in_minutes=3 * 24 * 60)
-        self.assertEqual(
+        self.assertFalse(
             ScheduledEmail.objects.filter(
                 address="bob@zulip.com", type=ScheduledEmail.INVITATION_REMINDER
-            ).count(),
-            0,
+            ).exists()
         )
 
     # make sure users can't take a valid confirmation key from another
@@ -1865,7 +1868,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
             email=email, referred_by=inviter, realm=realm
         )
         url = create_confirmation_link(prereg_user, Confirmation.USER_REGISTRATION)
-        registration_key = url.split("/")[-1]
+        registration_key = self.get_key_from_confirmation_url(url)
 
         # Mainly a test of get_object_from_key, rather than of the invitation pathway
         with self.assertRaises(ConfirmationKeyError) as cm:
@@ -1874,7 +1877,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
 
         # Verify that using the wrong type doesn't work in the main confirm code path
         email_change_url = create_confirmation_link(prereg_user, Confirmation.EMAIL_CHANGE)
-        email_change_key = email_change_url.split("/")[-1]
+        email_change_key = self.get_key_from_confirmation_url(email_change_url)
         result = self.client_post("/accounts/register/", {"key": email_change_key})
         self.assertEqual(result.status_code, 404)
         self.assert_in_response(
@@ -1892,7 +1895,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         with time_machine.travel(date_sent, tick=False):
             url = create_confirmation_link(prereg_user, Confirmation.USER_REGISTRATION)
 
-        key = url.split("/")[-1]
+        key = self.get_key_from_confirmation_url(url)
         confirmation_link_path = "/" + url.split("/", 3)[3]
         # Both the confirmation link and submitting the key to the registration endpoint
         # directly will return the appropriate error.
@@ -1918,10 +1921,12 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         activation_url = create_confirmation_link(
             prereg_user, Confirmation.INVITATION, validity_in_minutes=None
         )
-        confirmation = Confirmation.objects.last()
-        assert confirmation is not None
-        self.assertEqual(confirmation.expiry_date, None)
-        activation_key = activation_url.split("/")[-1]
+        activation_key = self.get_key_from_confirmation_url(activation_url)
+        self.assertIsNone(
+            Confirmation.objects.values_list("expiry_date", flat=True).get(
+                confirmation_key=activation_key
+            )
+        )
         response = self.client_post(
             "/accounts/register/",
             {"key": activation_key, "from_confirmation": 1, "full_nme": "alice"},
@@ -1935,7 +1940,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
             for stream_name in ["Denmark", "Scotland"]
         ]
 
-        invite_expires_in_minutes = 2 * 24 * 60
+        invite_expires_in_minutes = INVITE_EXPIRES_IN_MINUTES
         with self.captureOnCommitCallbacks(execute=True):
             do_invite_users(
                 self.user_profile,
@@ -1985,24 +1990,38 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
             acting_user=None,
         )
 
-        accepted_invite = PreregistrationUser.objects.filter(
-            email__iexact="foo@zulip.com", status=confirmation_settings.STATUS_USED
-        )
-        revoked_invites = PreregistrationUser.objects.filter(
-            email__iexact="foo@zulip.com", status=confirmation_settings.STATUS_REVOKED
+        invite_rows = list(
+            PreregistrationUser.objects.filter(email__iexact="foo@zulip.com").values_list(
+                "id", "status", "realm_id", "created_user_id"
+            )
         )
         # If a user was invited more than once, when it accepts one invite and register
         # the others must be canceled.
-        self.assert_length(accepted_invite, 1)
-        self.assertEqual(accepted_invite[0].id, prereg_user.id)
-        self.assertEqual(accepted_invite[0].created_user, created_user)
-
-        expected_revoked_invites = set(invites.exclude(id=prereg_user.id).exclude(realm=lear))
-        self.assertEqual(set(revoked_invites), expected_revoked_invites)
-
-        self.assertEqual(
-            PreregistrationUser.objects.get(email__iexact="foo@zulip.com", realm=lear).status, 0
-        )
+        accepted_invites = [
+            (invite_id, created_user_id)
+            for invite_id, status, realm_id, created_user_id in invite_rows
+            if status == confirmation_settings.STATUS_USED
+        ]
+        self.assertEqual(accepted_invites, [(prereg_user.id, created_user.id)])
+
+        revoked_invite_ids = {
+            invite_id
+            for invite_id, status, realm_id, created_user_id in invite_rows
+            if status == confirmation_settings.STATUS_REVOKED
+        }
+        expected_revoked_invite_ids = {
+            invite_id
+            for invite_id, status, realm_id, created_user_id in invite_rows
+            if invite_id != prereg_user.id and realm_id != lear.id
+        }
+        self.assertEqual(revoked_invite_ids, expected_revoked_invite_ids)
+
+        lear_invite_statuses = [
+            status
+            for invite_id, status, realm_id, created_user_id in invite_rows
+            if realm_id == lear.id
+        ]
+        self.assertEqual(lear_invite_statuses, [0])
 
         with self.assertRaises(AssertionError):
             process_new_human_user(created_user, prereg_user)
@@ -2032,7 +2051,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
             "Whoops. We couldn't find your confirmation link in the system.", response
         )
 
-        registration_key = confirmation_link.split("/")[-1]
+        registration_key = self.get_key_from_confirmation_url(confirmation_link)
         response = self.client_post(
             url, {"key": registration_key, "from_confirmation": 1, "full_name": "alice"}
         )
@@ -2052,7 +2071,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         )
 
         confirmation_link = create_confirmation_link(prereg_user, Confirmation.USER_REGISTRATION)
-        registration_key = confirmation_link.split("/")[-1]
+        registration_key = self.get_key_from_confirmation_url(confirmation_link)
 
         url = "/accounts/register/"
         self.client_post(
@@ -2066,7 +2085,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         new_confirmation_link = create_confirmation_link(
             new_prereg_user, Confirmation.USER_REGISTRATION
         )
-        new_registration_key = new_confirmation_link.split("/")[-1]
+        new_registration_key = self.get_key_from_confirmation_url(new_confirmation_link)
         url = "/accounts/register/"
         response = self.client_post(
             url, {"key": new_registration_key, "from_confirmation": 1, "full_name": "alice"}
@@ -2087,7 +2106,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         )
 
         confirmation_link = create_confirmation_link(prereg_user, Confirmation.USER_REGISTRATION)
-        registration_key = confirmation_link.split("/")[-1]
+        registration_key = self.get_key_from_confirmation_url(confirmation_link)
 
         url = "/accounts/register/"
         self.client_post(
@@ -2110,12 +2129,11 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         realm = get_realm("zulip")
 
         email = self.nonreg_email("alice")
-        realm = get_realm("zulip")
         prereg_user = PreregistrationUser.objects.create(
             email=email, referred_by=inviter, realm=realm
         )
         confirmation_link = create_confirmation_link(prereg_user, Confirmation.USER_REGISTRATION)
-        registration_key = confirmation_link.split("/")[-1]
+        registration_key = self.get_key_from_confirmation_url(confirmation_link)
         url = "/accounts/register/"
         self.client_post(
             url, {"key": registration_key, "from_confirmation": 1, "full_name": "alice"}
@@ -2137,7 +2155,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
             email=email, referred_by=inviter, realm=realm
         )
         confirmation_link = create_confirmation_link(prereg_user, Confirmation.USER_REGISTRATION)
-        registration_key = confirmation_link.split("/")[-1]
+        registration_key = self.get_key_from_confirmation_url(confirmation_link)
         url = "/accounts/register/"
         self.client_post(url, {"key": registration_key, "from_confirmation": 1, "full_name": "bob"})
         response = self.submit_reg_form_for_user(email, "password", key=registration_key)
@@ -2154,7 +2172,7 @@ so we didn't send them an invitation. We did send invitations to everyone else!"
         confirmation_link = create_confirmation_link(
             guest_prereg_user, Confirmation.USER_REGISTRATION
         )
-        registration_key = confirmation_link.split("/")[-1]
+        registration_key = self.get_key_from_confirmation_url(confirmation_link)
         url = "/accounts/register/"
 
         self.client_post(
@@ -2171,22 +2189,13 @@ class InvitationsTestCase(InviteUserBase):
         hamlet = self.example_user("hamlet")
         othello = self.example_user("othello")
 
-        streams = [
-            get_stream(stream_name, user_profile.realm) for stream_name in ["Denmark", "Scotland"]
-        ]
+        streams = get_streams_by_name(user_profile.realm, ["Denmark", "Scotland"])
 
-        invite_expires_in_minutes = 2 * 24 * 60
+        invite_expires_in_minutes = INVITE_EXPIRES_IN_MINUTES
         with self.captureOnCommitCallbacks(execute=True):
             do_invite_users(
                 user_profile,
-                ["TestOne@zulip.com"],
-                streams,
-                include_realm_default_subscriptions=False,
-                invite_expires_in_minutes=invite_expires_in_minutes,
-            )
-            do_invite_users(
-                user_profile,
-                ["TestTwo@zulip.com"],
+                ["TestOne@zulip.com", "TestTwo@zulip.com"],
                 streams,
                 include_realm_default_subscriptions=False,
                 invite_expires_in_minutes=invite_expires_in_minutes,
@@ -2225,8 +2234,14 @@ class InvitationsTestCase(InviteUserBase):
             invite_expires_in_minutes,
             include_realm_default_subscriptions=False,
         )
-        self.assert_length(do_get_invites_controlled_by_user(user_profile), 6)
-        self.assert_length(do_get_invites_controlled_by_user(hamlet), 2)
+        # The invitations' confirmation objects and multiuse invites are
+        # fetched in bulk, not once per invitation.
+        with self.assert_database_query_count(4):
+            invites = do_get_invites_controlled_by_user(user_profile)
+        self.assert_length(invites, 6)
+        with self.assert_database_query_count(4):
+            invites = do_get_invites_controlled_by_user(hamlet)
+        self.assert_length(invites, 2)
         self.assert_length(do_get_invites_controlled_by_user(othello), 1)
 
     def test_successful_get_open_invitations(self) -> None:
@@ -2236,18 +2251,15 @@ class InvitationsTestCase(InviteUserBase):
         active_value = getattr(confirmation_settings, "STATUS_USED", "Wrong")
         self.assertNotEqual(active_value, "Wrong")
 
-        self.login("iago")
         user_profile = self.example_user("iago")
         self.login_user(user_profile)
 
         hamlet = self.example_user("hamlet")
         othello = self.example_user("othello")
 
-        streams = [
-            get_stream(stream_name, user_profile.realm) for stream_name in ["Denmark", "Scotland"]
-        ]
+        streams = get_streams_by_name(user_profile.realm, ["Denmark", "Scotland"])
 
-        invite_expires_in_minutes = 2 * 24 * 60
+        invite_expires_in_minutes = INVITE_EXPIRES_IN_MINUTES
         with self.captureOnCommitCallbacks(execute=True):
             do_invite_users(
                 user_profile,
@@ -2293,8 +2305,7 @@ class InvitationsTestCase(InviteUserBase):
         )
 
         result = self.client_get("/json/invites")
-        self.assertEqual(result.status_code, 200)
-        invites = orjson.loads(result.content)["invites"]
+        invites = self.assert_json_success(result)["invites"]
         self.assert_length(invites, 2)
 
         self.assertFalse(invites[0]["is_multiuse"])
@@ -2306,9 +2317,7 @@ class InvitationsTestCase(InviteUserBase):
         self.login("iago")
         user_profile = self.example_user("iago")
 
-        streams = [
-            get_stream(stream_name, user_profile.realm) for stream_name in ["Denmark", "Scotland"]
-        ]
+        streams = get_streams_by_name(user_profile.realm, ["Denmark", "Scotland"])
 
         with (
             time_machine.travel((timezone_now() - timedelta(days=1000)), tick=False),
@@ -2344,8 +2353,7 @@ class InvitationsTestCase(InviteUserBase):
             )
 
         result = self.client_get("/json/invites")
-        self.assertEqual(result.status_code, 200)
-        invites = orjson.loads(result.content)["invites"]
+        invites = self.assert_json_success(result)["invites"]
         # We only get invitations that will never expire because we have mocked time such
         # that the other invitations are created in the deep past.
         self.assert_length(invites, 2)
@@ -2369,18 +2377,22 @@ class InvitationsTestCase(InviteUserBase):
         prereg_user = PreregistrationUser.objects.get(email=invitee)
 
         # Verify that the scheduled email exists.
-        ScheduledEmail.objects.get(address__iexact=invitee, type=ScheduledEmail.INVITATION_REMINDER)
+        self.assertEqual(
+            ScheduledEmail.objects.filter(
+                address__iexact=invitee, type=ScheduledEmail.INVITATION_REMINDER
+            ).count(),
+            1,
+        )
 
         result = self.client_delete("/json/invites/" + str(prereg_user.id))
         self.assertEqual(result.status_code, 200)
         error_result = self.client_delete("/json/invites/" + str(prereg_user.id))
         self.assert_json_error(error_result, "No such invitation")
 
-        self.assertRaises(
-            ScheduledEmail.DoesNotExist,
-            lambda: ScheduledEmail.objects.get(
+        self.assertFalse(
+            ScheduledEmail.objects.filter(
                 address__iexact=invitee, type=ScheduledEmail.INVITATION_REMINDER
-            ),
+            ).exists()
         )
 
     def test_successful_member_delete_invitation(self) -> None:
@@ -2395,7 +2407,12 @@ class InvitationsTestCase(InviteUserBase):
 
         # Verify that the scheduled email exists.
         prereg_user = PreregistrationUser.objects.get(email=invitee, referred_by=user_profile)
-        ScheduledEmail.objects.get(address__iexact=invitee, type=ScheduledEmail.INVITATION_REMINDER)
+        self.assertEqual(
+            ScheduledEmail.objects.filter(
+                address__iexact=invitee, type=ScheduledEmail.INVITATION_REMINDER
+            ).count(),
+            1,
+        )
 
         # Verify another non-admin can't delete
         result = self.api_delete(
@@ -2404,8 +2421,12 @@ class InvitationsTestCase(InviteUserBase):
         self.assert_json_error(result, "Must be an organization administrator")
 
         # Verify that the scheduled email still exists.
-        prereg_user = PreregistrationUser.objects.get(email=invitee, referred_by=user_profile)
-        ScheduledEmail.objects.get(address__iexact=invitee, type=ScheduledEmail.INVITATION_REMINDER)
+        self.assertEqual(
+            ScheduledEmail.objects.filter(
+                address__iexact=invitee, type=ScheduledEmail.INVITATION_REMINDER
+            ).count(),
+            1,
+        )
 
         # Verify deletion works.
         result = self.api_delete(user_profile, "/api/v1/invites/" + str(prereg_user.id))
@@ -2414,11 +2435,10 @@ class InvitationsTestCase(InviteUserBase):
         result = self.api_delete(user_profile, "/api/v1/invites/" + str(prereg_user.id))
         self.assert_json_error(result, "No such invitation")
 
-        self.assertRaises(
-            ScheduledEmail.DoesNotExist,
-            lambda: ScheduledEmail.objects.get(
+        self.assertFalse(
+            ScheduledEmail.objects.filter(
                 address__iexact=invitee, type=ScheduledEmail.INVITATION_REMINDER
-            ),
+            ).exists()
         )
 
     def test_delete_owner_invitation(self) -> None:
@@ -2441,11 +2461,10 @@ class InvitationsTestCase(InviteUserBase):
         self.assert_json_success(result)
         result = self.api_delete(owner, "/api/v1/invites/" + str(prereg_user.id))
         self.assert_json_error(result, "No such invitation")
-        self.assertRaises(
-            ScheduledEmail.DoesNotExist,
-            lambda: ScheduledEmail.objects.get(
+        self.assertFalse(
+            ScheduledEmail.objects.filter(
                 address__iexact=invitee, type=ScheduledEmail.INVITATION_REMINDER
-            ),
+            ).exists()
         )
 
     def test_delete_multiuse_invite(self) -> None:
@@ -2456,19 +2475,16 @@ class InvitationsTestCase(InviteUserBase):
         self.login("iago")
 
         zulip_realm = get_realm("zulip")
-        multiuse_invite = MultiuseInvite.objects.create(
-            referred_by=self.example_user("hamlet"), realm=zulip_realm
-        )
-        validity_in_minutes = 2 * 24 * 60
+        hamlet = self.example_user("hamlet")
+        multiuse_invite = MultiuseInvite.objects.create(referred_by=hamlet, realm=zulip_realm)
+        validity_in_minutes = INVITE_EXPIRES_IN_MINUTES
         create_confirmation_link(
             multiuse_invite, Confirmation.MULTIUSE_INVITE, validity_in_minutes=validity_in_minutes
         )
         result = self.client_delete("/json/invites/multiuse/" + str(multiuse_invite.id))
         self.assertEqual(result.status_code, 200)
-        self.assertEqual(
-            MultiuseInvite.objects.get(id=multiuse_invite.id).status,
-            confirmation_settings.STATUS_REVOKED,
-        )
+        multiuse_invite.refresh_from_db(fields=["status"])
+        self.assertEqual(multiuse_invite.status, confirmation_settings.STATUS_REVOKED)
         # Test that trying to double-delete fails
         error_result = self.client_delete("/json/invites/multiuse/" + str(multiuse_invite.id))
         self.assert_json_error(error_result, "Invitation has already been revoked")
@@ -2489,15 +2505,11 @@ class InvitationsTestCase(InviteUserBase):
         self.login("desdemona")
         result = self.client_delete("/json/invites/multiuse/" + str(multiuse_invite.id))
         self.assert_json_success(result)
-        self.assertEqual(
-            MultiuseInvite.objects.get(id=multiuse_invite.id).status,
-            confirmation_settings.STATUS_REVOKED,
-        )
+        multiuse_invite.refresh_from_db(fields=["status"])
+        self.assertEqual(multiuse_invite.status, confirmation_settings.STATUS_REVOKED)
 
         # Test non-admins can only delete invitations created by them.
-        multiuse_invite = MultiuseInvite.objects.create(
-            referred_by=self.example_user("hamlet"), realm=zulip_realm
-        )
+        multiuse_invite = MultiuseInvite.objects.create(referred_by=hamlet, realm=zulip_realm)
         create_confirmation_link(
             multiuse_invite, Confirmation.MULTIUSE_INVITE, validity_in_minutes=validity_in_minutes
         )
@@ -2509,17 +2521,15 @@ class InvitationsTestCase(InviteUserBase):
         self.login("hamlet")
         result = self.client_delete("/json/invites/multiuse/" + str(multiuse_invite.id))
         self.assertEqual(result.status_code, 200)
-        self.assertEqual(
-            MultiuseInvite.objects.get(id=multiuse_invite.id).status,
-            confirmation_settings.STATUS_REVOKED,
-        )
+        multiuse_invite.refresh_from_db(fields=["status"])
+        self.assertEqual(multiuse_invite.status, confirmation_settings.STATUS_REVOKED)
 
         # Test deleting multiuse invite from another realm
         mit_realm = get_realm("zephyr")
         multiuse_invite_in_mit = MultiuseInvite.objects.create(
             referred_by=self.mit_user("sipbtest"), realm=mit_realm
         )
-        validity_in_minutes = 2 * 24 * 60
+        validity_in_minutes = INVITE_EXPIRES_IN_MINUTES
         create_confirmation_link(
             multiuse_invite_in_mit,
             Confirmation.MULTIUSE_INVITE,
@@ -2530,7 +2540,8 @@ class InvitationsTestCase(InviteUserBase):
         )
         self.assert_json_error(error_result, "No such invitation")
 
-        non_existent_id = MultiuseInvite.objects.count() + 9999
+        # Larger than any ID the test database's sequence will reach.
+        non_existent_id = 2**31 - 1
         error_result = self.client_delete(f"/json/invites/multiuse/{non_existent_id}")
         self.assert_json_error(error_result, "No such invitation")
 
@@ -2546,31 +2557,26 @@ class InvitationsTestCase(InviteUserBase):
         prereg_user = PreregistrationUser.objects.get(email=invitee)
 
         # Verify and then clear from the outbox the original invite email
-        self.check_sent_emails([invitee])
-        mail.outbox.pop()
+        self.check_sent_emails([invitee], clear=True)
 
         # Verify that the scheduled email exists.
         scheduledemail_filter = ScheduledEmail.objects.filter(
             address__iexact=invitee, type=ScheduledEmail.INVITATION_REMINDER
-        )
-        self.assertEqual(scheduledemail_filter.count(), 1)
-        original_timestamp = scheduledemail_filter.values_list("scheduled_timestamp", flat=True)
+        ).values_list("id", "scheduled_timestamp")
+        original_scheduled_emails = list(scheduledemail_filter.all())
+        self.assert_length(original_scheduled_emails, 1)
 
         # Resend invite
         with self.captureOnCommitCallbacks(execute=True):
             result = self.client_post("/json/invites/" + str(prereg_user.id) + "/resend")
-        self.assertEqual(
-            ScheduledEmail.objects.filter(
-                address__iexact=invitee, type=ScheduledEmail.INVITATION_REMINDER
-            ).count(),
-            1,
-        )
 
         # Check that we have exactly one scheduled email, and that it is different
-        self.assertEqual(scheduledemail_filter.count(), 1)
-        self.assertNotEqual(
-            original_timestamp, scheduledemail_filter.values_list("scheduled_timestamp", flat=True)
-        )
+        scheduled_emails = list(scheduledemail_filter.all())
+        self.assert_length(scheduled_emails, 1)
+        [(scheduled_email_id, scheduled_timestamp)] = scheduled_emails
+        [(original_scheduled_email_id, original_scheduled_timestamp)] = original_scheduled_emails
+        self.assertNotEqual(scheduled_email_id, original_scheduled_email_id)
+        self.assertNotEqual(scheduled_timestamp, original_scheduled_timestamp)
 
         self.assertEqual(result.status_code, 200)
         error_result = self.client_post("/json/invites/" + str(9999) + "/resend")
@@ -2590,34 +2596,30 @@ class InvitationsTestCase(InviteUserBase):
         # Verify hamlet has only one invitation (Member can resend invitations only sent by him).
         invitation = PreregistrationUser.objects.filter(referred_by=user_profile)
         self.assert_length(invitation, 1)
-        prereg_user = PreregistrationUser.objects.get(email=invitee)
+        prereg_user = invitation[0]
+        self.assertEqual(prereg_user.email, invitee)
 
         # Verify and then clear from the outbox the original invite email
-        self.check_sent_emails([invitee])
-        mail.outbox.pop()
+        self.check_sent_emails([invitee], clear=True)
 
         # Verify that the scheduled email exists.
         scheduledemail_filter = ScheduledEmail.objects.filter(
             address__iexact=invitee, type=ScheduledEmail.INVITATION_REMINDER
-        )
-        self.assertEqual(scheduledemail_filter.count(), 1)
-        original_timestamp = scheduledemail_filter.values_list("scheduled_timestamp", flat=True)
+        ).values_list("id", "scheduled_timestamp")
+        original_scheduled_emails = list(scheduledemail_filter.all())
+        self.assert_length(original_scheduled_emails, 1)
 
         # Resend invite
         with self.captureOnCommitCallbacks(execute=True):
             result = self.client_post("/json/invites/" + str(prereg_user.id) + "/resend")
-        self.assertEqual(
-            ScheduledEmail.objects.filter(
-                address__iexact=invitee, type=ScheduledEmail.INVITATION_REMINDER
-            ).count(),
-            1,
-        )
 
         # Check that we have exactly one scheduled email, and that it is different
-        self.assertEqual(scheduledemail_filter.count(), 1)
-        self.assertNotEqual(
-            original_timestamp, scheduledemail_filter.values_list("scheduled_timestamp", flat=True)
-        )
+        scheduled_emails = list(scheduledemail_filter.all())
+        self.assert_length(scheduled_emails, 1)
+        [(scheduled_email_id, scheduled_timestamp)] = scheduled_emails
+        [(original_scheduled_email_id, original_scheduled_timestamp)] = original_scheduled_emails
+        self.assertNotEqual(scheduled_email_id, original_scheduled_email_id)
+        self.assertNotEqual(scheduled_timestamp, original_scheduled_timestamp)
 
         self.assertEqual(result.status_code, 200)
         error_result = self.client_post("/json/invites/" + str(9999) + "/resend")
@@ -2630,8 +2632,7 @@ class InvitationsTestCase(InviteUserBase):
         invitee = "TestOne@zulip.com"
         prereg_user_one = PreregistrationUser(email=invitee, referred_by=user_profile)
         prereg_user_one.save()
-        prereg_user = PreregistrationUser.objects.get(email=invitee)
-        error_result = self.client_post("/json/invites/" + str(prereg_user.id) + "/resend")
+        error_result = self.client_post("/json/invites/" + str(prereg_user_one.id) + "/resend")
         self.assert_json_error(error_result, "Must be an organization administrator")
 
     def test_resend_owner_invitation(self) -> None:
@@ -2646,9 +2647,9 @@ class InvitationsTestCase(InviteUserBase):
         self.check_sent_emails([invitee])
         scheduledemail_filter = ScheduledEmail.objects.filter(
             address__iexact=invitee, type=ScheduledEmail.INVITATION_REMINDER
-        )
-        self.assertEqual(scheduledemail_filter.count(), 1)
-        original_timestamp = scheduledemail_filter.values_list("scheduled_timestamp", flat=True)
+        ).values_list("id", "scheduled_timestamp")
+        original_scheduled_emails = list(scheduledemail_filter.all())
+        self.assert_length(original_scheduled_emails, 1)
 
         # Test only organization owners can resend owner invitation.
         self.login("iago")
@@ -2661,18 +2662,13 @@ class InvitationsTestCase(InviteUserBase):
             result = self.client_post("/json/invites/" + str(prereg_user.id) + "/resend")
         self.assert_json_success(result)
 
-        self.assertEqual(
-            ScheduledEmail.objects.filter(
-                address__iexact=invitee, type=ScheduledEmail.INVITATION_REMINDER
-            ).count(),
-            1,
-        )
-
         # Check that we have exactly one scheduled email, and that it is different
-        self.assertEqual(scheduledemail_filter.count(), 1)
-        self.assertNotEqual(
-            original_timestamp, scheduledemail_filter.values_list("scheduled_timestamp", flat=True)
-        )
+        scheduled_emails = list(scheduledemail_filter.all())
+        self.assert_length(scheduled_emails, 1)
+        [(scheduled_email_id, scheduled_timestamp)] = scheduled_emails
+        [(original_scheduled_email_id, original_scheduled_timestamp)] = original_scheduled_emails
+        self.assertNotEqual(scheduled_email_id, original_scheduled_email_id)
+        self.assertNotEqual(scheduled_timestamp, original_scheduled_timestamp)
 
     def test_resend_never_expiring_invitation(self) -> None:
         self.login("iago")
@@ -2682,8 +2678,7 @@ class InvitationsTestCase(InviteUserBase):
         prereg_user = PreregistrationUser.objects.get(email=invitee)
 
         # Verify and then clear from the outbox the original invite email
-        self.check_sent_emails([invitee])
-        mail.outbox.pop()
+        self.check_sent_emails([invitee], clear=True)
 
         with self.captureOnCommitCallbacks(execute=True):
             result = self.client_post("/json/invites/" + str(prereg_user.id) + "/resend")
@@ -2713,7 +2708,7 @@ class InvitationsTestCase(InviteUserBase):
         )
 
         confirmation_link = create_confirmation_link(prereg_user, Confirmation.USER_REGISTRATION)
-        registration_key = confirmation_link.split("/")[-1]
+        registration_key = self.get_key_from_confirmation_url(confirmation_link)
 
         result = self.client_post(
             "/accounts/register/",
@@ -2764,6 +2759,11 @@ class InviteeEmailsParserTests(ZulipTestCase):
         expected_set = {self.email1, self.email2, self.email3}
         self.assertEqual(get_invitee_emails_set(emails_raw), expected_set)
 
+    def test_if_emails_with_empty_entries_are_parsed_correctly(self) -> None:
+        emails_raw = f"{self.email1},     {self.email2},\n    {self.email3}\n\n\n<>, Name <>"
+        expected_set = {self.email1, self.email2, self.email3, ""}
+        self.assertEqual(get_invitee_emails_set(emails_raw), expected_set)
+
 
 class MultiuseInviteTest(ZulipTestCase):
     @override
@@ -2780,22 +2780,31 @@ class MultiuseInviteTest(ZulipTestCase):
         user_groups: list[NamedUserGroup] | None = None,
         include_realm_default_subscriptions: bool = False,
     ) -> str:
-        invite = MultiuseInvite(
+        invite = MultiuseInvite.objects.create(
             realm=self.realm,
             referred_by=self.example_user("iago"),
             include_realm_default_subscriptions=include_realm_default_subscriptions,
         )
-        invite.save()
 
-        if streams is not None:
-            invite.streams.set(streams)
+        # The invite was just created, so there are no existing
+        # memberships for .set() to diff against.
+        if streams:
+            MultiuseInviteStream = MultiuseInvite.streams.through
+            MultiuseInviteStream.objects.bulk_create(
+                MultiuseInviteStream(multiuseinvite_id=invite.id, stream_id=stream.id)
+                for stream in streams
+            )
 
-        if user_groups is not None:
-            invite.groups.set(user_groups)
+        if user_groups:
+            MultiuseInviteGroup = MultiuseInvite.groups.through
+            MultiuseInviteGroup.objects.bulk_create(
+                MultiuseInviteGroup(multiuseinvite_id=invite.id, namedusergroup_id=user_group.id)
+                for user_group in user_groups
+            )
 
         if date_sent is None:
             date_sent = timezone_now()
-        validity_in_minutes = 2 * 24 * 60
+        validity_in_minutes = INVITE_EXPIRES_IN_MINUTES
         with time_machine.travel(date_sent, tick=False):
             return create_confirmation_link(
                 invite, Confirmation.MULTIUSE_INVITE, validity_in_minutes=validity_in_minutes
@@ -2823,9 +2832,9 @@ class MultiuseInviteTest(ZulipTestCase):
         prereg_user = PreregistrationUser.objects.last()
         multiuse_invite = MultiuseInvite.objects.last()
 
-        assert prereg_user is not None
+        assert prereg_user is not None and multiuse_invite is not None
         self.assertEqual(prereg_user.email, email)
-        self.assertEqual(prereg_user.multiuse_invite, multiuse_invite)
+        self.assertEqual(prereg_user.multiuse_invite_id, multiuse_invite.id)
 
         mail.outbox.pop()
 
@@ -2896,13 +2905,13 @@ class MultiuseInviteTest(ZulipTestCase):
         email5 = self.nonreg_email(name5)
 
         stream_names = ["Rome", "Scotland", "Venice"]
-        streams = [get_stream(stream_name, self.realm) for stream_name in stream_names]
+        streams = get_streams_by_name(self.realm, stream_names)
         invite_link = self.generate_multiuse_invite_link(streams=streams)
         self.check_user_able_to_register(email1, invite_link)
         self.check_user_subscribed_only_to_streams(name1, set(streams))
 
         stream_names = ["Rome", "Verona"]
-        streams = [get_stream(stream_name, self.realm) for stream_name in stream_names]
+        streams = get_streams_by_name(self.realm, stream_names)
         invite_link = self.generate_multiuse_invite_link(streams=streams)
         self.check_user_able_to_register(email2, invite_link)
         self.check_user_subscribed_only_to_streams(name2, set(streams))
@@ -2930,7 +2939,6 @@ class MultiuseInviteTest(ZulipTestCase):
             streams=[rome], include_realm_default_subscriptions=True
         )
         self.check_user_able_to_register(email5, invite_link)
-        rome = get_stream("Rome", self.realm)
         self.check_user_subscribed_only_to_streams(
             name5,
             {rome} | default_streams,
@@ -2990,7 +2998,7 @@ class MultiuseInviteTest(ZulipTestCase):
         self.login("iago")
 
         result = self.client_post(
-            "/json/invites/multiuse", {"invite_expires_in_minutes": 2 * 24 * 60}
+            "/json/invites/multiuse", {"invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES}
         )
         invite_link = self.assert_json_success(result)["invite_link"]
         self.check_user_able_to_register(self.nonreg_email("test"), invite_link)
@@ -2998,14 +3006,14 @@ class MultiuseInviteTest(ZulipTestCase):
     def test_create_multiuse_link_with_specified_streams_api_call(self) -> None:
         self.login("iago")
         stream_names = ["Rome", "Scotland", "Venice"]
-        streams = [get_stream(stream_name, self.realm) for stream_name in stream_names]
+        streams = get_streams_by_name(self.realm, stream_names)
         stream_ids = [stream.id for stream in streams]
 
         result = self.client_post(
             "/json/invites/multiuse",
             {
                 "stream_ids": orjson.dumps(stream_ids).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
             },
         )
         invite_link = self.assert_json_success(result)["invite_link"]
@@ -3026,7 +3034,7 @@ class MultiuseInviteTest(ZulipTestCase):
             "/json/invites/multiuse",
             {
                 "stream_ids": orjson.dumps(stream_ids).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
                 "include_realm_default_subscriptions": orjson.dumps(True).decode(),
             },
         )
@@ -3044,7 +3052,7 @@ class MultiuseInviteTest(ZulipTestCase):
             "/json/invites/multiuse",
             {
                 "stream_ids": orjson.dumps(stream_ids).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
                 "include_realm_default_subscriptions": orjson.dumps(True).decode(),
             },
         )
@@ -3060,7 +3068,7 @@ class MultiuseInviteTest(ZulipTestCase):
             "/json/invites/multiuse",
             {
                 "stream_ids": orjson.dumps(stream_ids).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
                 "include_realm_default_subscriptions": orjson.dumps(False).decode(),
             },
         )
@@ -3082,7 +3090,7 @@ class MultiuseInviteTest(ZulipTestCase):
             "/json/invites/multiuse",
             {
                 "group_ids": orjson.dumps(group_ids).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
             },
         )
         invite_link = self.assert_json_success(result)["invite_link"]
@@ -3103,7 +3111,7 @@ class MultiuseInviteTest(ZulipTestCase):
             "/json/invites/multiuse",
             {
                 "group_ids": orjson.dumps(group_ids).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
             },
         )
         invite_link = self.assert_json_success(result)["invite_link"]
@@ -3135,13 +3143,13 @@ class MultiuseInviteTest(ZulipTestCase):
 
         self.login("hamlet")
         stream_names = ["Rome", "Scotland", "Venice"]
-        streams = [get_stream(stream_name, self.realm) for stream_name in stream_names]
+        streams = get_streams_by_name(self.realm, stream_names)
         stream_ids = [stream.id for stream in streams]
         result = self.client_post(
             "/json/invites/multiuse",
             {
                 "stream_ids": orjson.dumps(stream_ids).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
             },
         )
         self.assert_json_error(
@@ -3152,7 +3160,7 @@ class MultiuseInviteTest(ZulipTestCase):
             "/json/invites/multiuse",
             {
                 "stream_ids": orjson.dumps([]).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
                 "include_realm_default_subscriptions": orjson.dumps(True).decode(),
             },
         )
@@ -3167,7 +3175,7 @@ class MultiuseInviteTest(ZulipTestCase):
             "/json/invites/multiuse",
             {
                 "stream_ids": orjson.dumps(stream_ids).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
             },
         )
         self.assert_json_success(result)
@@ -3180,7 +3188,7 @@ class MultiuseInviteTest(ZulipTestCase):
             "/json/invites/multiuse",
             {
                 "stream_ids": orjson.dumps(stream_ids).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
             },
         )
         self.assert_json_success(result)
@@ -3219,7 +3227,7 @@ class MultiuseInviteTest(ZulipTestCase):
                 "/json/invites/multiuse",
                 {
                     "group_ids": orjson.dumps(group_ids).decode(),
-                    "invite_expires_in_minutes": 2 * 24 * 60,
+                    "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
                 },
             )
             if error_msg is not None:
@@ -3400,7 +3408,7 @@ class MultiuseInviteTest(ZulipTestCase):
             "/json/invites/multiuse",
             {
                 "invite_as": orjson.dumps(PreregistrationUser.INVITE_AS["REALM_OWNER"]).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
             },
         )
         self.assert_json_error(result, "Must be an organization owner")
@@ -3410,7 +3418,7 @@ class MultiuseInviteTest(ZulipTestCase):
             "/json/invites/multiuse",
             {
                 "invite_as": orjson.dumps(PreregistrationUser.INVITE_AS["REALM_OWNER"]).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
             },
         )
         invite_link = self.assert_json_success(result)["invite_link"]
@@ -3431,7 +3439,7 @@ class MultiuseInviteTest(ZulipTestCase):
             "/json/invites/multiuse",
             {
                 "invite_as": orjson.dumps(PreregistrationUser.INVITE_AS["REALM_ADMIN"]).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
             },
         )
         self.assert_json_error(result, "Must be an organization administrator")
@@ -3441,7 +3449,7 @@ class MultiuseInviteTest(ZulipTestCase):
             "/json/invites/multiuse",
             {
                 "invite_as": orjson.dumps(PreregistrationUser.INVITE_AS["REALM_ADMIN"]).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
             },
         )
         invite_link = self.assert_json_success(result)["invite_link"]
@@ -3462,7 +3470,7 @@ class MultiuseInviteTest(ZulipTestCase):
             "/json/invites/multiuse",
             {
                 "invite_as": orjson.dumps(PreregistrationUser.INVITE_AS["MODERATOR"]).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
             },
         )
         self.assert_json_error(result, "Must be an organization administrator")
@@ -3472,7 +3480,7 @@ class MultiuseInviteTest(ZulipTestCase):
             "/json/invites/multiuse",
             {
                 "invite_as": orjson.dumps(PreregistrationUser.INVITE_AS["MODERATOR"]).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
             },
         )
         self.assert_json_error(result, "Must be an organization administrator")
@@ -3482,7 +3490,7 @@ class MultiuseInviteTest(ZulipTestCase):
             "/json/invites/multiuse",
             {
                 "invite_as": orjson.dumps(PreregistrationUser.INVITE_AS["REALM_ADMIN"]).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
             },
         )
         invite_link = self.assert_json_success(result)["invite_link"]
@@ -3494,7 +3502,7 @@ class MultiuseInviteTest(ZulipTestCase):
             "/json/invites/multiuse",
             {
                 "stream_ids": orjson.dumps([54321]).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
             },
         )
         self.assert_json_error(result, "Invalid channel ID 54321. No invites were sent.")
@@ -3505,7 +3513,7 @@ class MultiuseInviteTest(ZulipTestCase):
             "/json/invites/multiuse",
             {
                 "group_ids": orjson.dumps([5438]).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
             },
         )
         self.assert_json_error(result, "Invalid user group")
@@ -3516,7 +3524,7 @@ class MultiuseInviteTest(ZulipTestCase):
             "/json/invites/multiuse",
             {
                 "invite_as": orjson.dumps(PreregistrationUser.INVITE_AS["GUEST_USER"] + 1).decode(),
-                "invite_expires_in_minutes": 2 * 24 * 60,
+                "invite_expires_in_minutes": INVITE_EXPIRES_IN_MINUTES,
             },
         )
         self.assert_json_error(
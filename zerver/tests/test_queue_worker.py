@@ -6,6 +6,7 @@ from collections import defaultdict
 from collections.abc import Callable, Iterator, Mapping
 from contextlib import contextmanager, suppress
 from datetime import datetime, timedelta, timezone
+from smtplib import SMTPServerDisconnected
 from typing import Any, TypeAlias
 from unittest.mock import MagicMock, patch
 
@@ -24,7 +25,7 @@ from zerver.lib.remote_server import PushNotificationBouncerRetryLaterError
 from zerver.lib.send_email import EmailNotDeliveredError, FromAddress
 from zerver.lib.test_classes import ZulipTestCase
 from zerver.lib.test_helpers import mock_queue_publish
-from zerver.models import ScheduledMessageNotificationEmail, UserActivity, UserProfile
+from zerver.models import Realm, ScheduledMessageNotificationEmail, UserActivity, UserProfile
 from zerver.models.clients import get_client
 from zerver.models.realms import get_realm
 from zerver.models.scheduled_jobs import NotificationTriggers
@@ -709,6 +710,138 @@ class WorkerTest(ZulipTestCase):
 
         self.assertEqual(data["failed_tries"], 1 + MAX_REQUEST_RETRIES)
 
+    def test_email_sending_worker_fetches_realms_once_per_batch(self) -> None:
+        zulip_realm = get_realm("zulip")
+        lear_realm = get_realm("lear")
+        events = [
+            {
+                "template_prefix": "zerver/emails/invitation",
+                "to_emails": [f"invitee{i}@example.com"],
+                "from_address": FromAddress.NOREPLY,
+                "language": "en",
+                "context": {},
+                "realm_id": realm.id,
+            }
+            for i, realm in enumerate([zulip_realm, zulip_realm, lear_realm, zulip_realm])
+        ]
+
+        worker = ImmediateEmailSenderWorker()
+        with (
+            patch("zerver.worker.email_senders_base.send_immediate_email") as mock_send,
+            self.assert_database_query_count(1),
+        ):
+            worker.consume_batch(events)
+
+        self.assertEqual(
+            [call.kwargs["realm"] for call in mock_send.call_args_list],
+            [zulip_realm, zulip_realm, lear_realm, zulip_realm],
+        )
+
+    def test_email_sending_worker_deleted_realm(self) -> None:
+        event = {
+            "template_prefix": "zerver/emails/invitation",
+            "to_emails": ["invitee@example.com"],
+            "from_address": FromAddress.NOREPLY,
+            "language": "en",
+            "context": {},
+            "realm_id": 2**31 - 1,
+        }
+
+        worker = ImmediateEmailSenderWorker()
+        with (
+            patch("zerver.worker.email_senders_base.send_immediate_email") as mock_send,
+            self.assertRaisesRegex(Realm.DoesNotExist, f"Realm {2**31 - 1} does not exist"),
+        ):
+            worker.consume_batch([event])
+        mock_send.assert_not_called()
+
+    def test_email_sending_worker_checks_connection_once_per_batch(self) -> None:
+        events = [
+            {
+                "template_prefix": "zerver/emails/invitation",
+                "to_emails": [f"invitee{i}@example.com"],
+                "from_address": FromAddress.NOREPLY,
+                "language": "en",
+                "context": {},
+            }
+            for i in range(3)
+        ]
+
+        worker = ImmediateEmailSenderWorker()
+        with (
+            patch("zerver.worker.email_senders_base.initialize_connection") as mock_initialize,
+            patch("zerver.worker.email_senders_base.send_immediate_email") as mock_send,
+        ):
+            worker.consume_batch(events)
+            self.assertEqual(mock_initialize.call_count, 1)
+            self.assertEqual(mock_send.call_count, 3)
+
+        # After a failed send, the connection is checked again before
+        # the next email in the batch.
+        worker = ImmediateEmailSenderWorker()
+        with (
+            patch("zerver.worker.email_senders_base.initialize_connection") as mock_initialize,
+            patch(
+                "zerver.worker.email_senders_base.send_immediate_email",
+                side_effect=[None, EmailNotDeliveredError, None],
+            ) as mock_send,
+            patch("zerver.worker.email_senders_base.retry_event") as mock_retry,
+        ):
+            worker.consume_batch(events)
+            self.assertEqual(mock_initialize.call_count, 2)
+            self.assertEqual(mock_send.call_count, 3)
+            mock_retry.assert_called_once()
+
+    def test_email_sending_worker_reconnects_after_disconnect(self) -> None:
+        events = [
+            {
+                "template_prefix": "zerver/emails/invitation",
+                "to_emails": [f"invitee{i}@example.com"],
+                "from_address": FromAddress.NOREPLY,
+                "language": "en",
+                "context": {},
+            }
+            for i in range(3)
+        ]
+
+        # The server closes the connection before the second email;
+        # the worker reconnects, and sends that email again.
+        worker = ImmediateEmailSenderWorker()
+        with (
+            patch("zerver.worker.email_senders_base.initialize_connection") as mock_initialize,
+            patch(
+                "zerver.worker.email_senders_base.send_immediate_email",
+                side_effect=[None, SMTPServerDisconnected, None, None],
+            ) as mock_send,
+            patch("zerver.worker.email_senders_base.retry_event") as mock_retry,
+        ):
+            worker.consume_batch(events)
+            self.assertEqual(mock_initialize.call_count, 2)
+            self.assertEqual(
+                [call.kwargs["to_emails"] for call in mock_send.call_args_list],
+                [
+                    ["invitee0@example.com"],
+                    ["invitee1@example.com"],
+                    ["invitee1@example.com"],
+                    ["invitee2@example.com"],
+                ],
+            )
+            mock_retry.assert_not_called()
+
+        # If the new connection is dropped too, the event is retried later.
+        worker = ImmediateEmailSenderWorker()
+        with (
+            patch("zerver.worker.email_senders_base.initialize_connection") as mock_initialize,
+            patch(
+                "zerver.worker.email_senders_base.send_immediate_email",
+                side_effect=[SMTPServerDisconnected, SMTPServerDisconnected],
+            ),
+            patch("zerver.worker.email_senders_base.retry_event") as mock_retry,
+        ):
+            worker.consume_batch(events[:1])
+            self.assertEqual(mock_initialize.call_count, 2)
+            mock_retry.assert_called_once()
+
     def test_error_handling(self) -> None:
         processed = []
 
@@ -1,4 +1,10 @@
-from smtplib import SMTP, SMTPDataError, SMTPException, SMTPRecipientsRefused
+from smtplib import (
+    SMTP,
+    SMTPDataError,
+    SMTPException,
+    SMTPRecipientsRefused,
+    SMTPServerDisconnected,
+)
 from unittest import mock
 
 from django.core.mail.backends.locmem import EmailBackend
@@ -12,6 +18,7 @@ from zerver.lib.send_email import (
     initialize_connection,
     logger,
     send_email,
+    send_immediate_email,
 )
 from zerver.lib.test_classes import ZulipTestCase
 
@@ -150,6 +157,25 @@ class TestSendEmail(ZulipTestCase):
                 )
                 self.assertTrue(info_log.output[1].startswith(f"ERROR:zulip.send_email:{message}"))
 
+    def test_send_email_disconnect_on_reused_connection(self) -> None:
+        hamlet = self.example_user("hamlet")
+        backend = EmailBackend()
+        with mock.patch.object(backend, "send_messages", side_effect=SMTPServerDisconnected):
+            # A caller reusing its own connection gets the disconnect
+            # back, so that it can reconnect.
+            with (
+                self.assertLogs(logger=logger) as info_log,
+                self.assertRaises(SMTPServerDisconnected),
+            ):
+                send_immediate_email(
+                    "zerver/emails/password_reset",
+                    to_emails=[hamlet.email],
+                    from_address=FromAddress.NOREPLY,
+                    language="en",
+                    connection=backend,
+                )
+            self.assert_length(info_log.records, 1)
+
     def test_send_email_config_error_logging(self) -> None:
         hamlet = self.example_user("hamlet")
 
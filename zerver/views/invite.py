@@ -32,14 +32,24 @@ from zerver.models import MultiuseInvite, NamedUserGroup, PreregistrationUser, S
 # https://github.com/python/mypy/issues/13234
 INVITATION_LINK_VALIDITY_MINUTES: int | None = 24 * 60 * settings.INVITATION_LINK_VALIDITY_DAYS
 
+INVITE_AS_VALUES = list(PreregistrationUser.INVITE_AS.values())
+INVITE_AS_MEMBER = PreregistrationUser.INVITE_AS["MEMBER"]
+INVITE_AS_REALM_OWNER = PreregistrationUser.INVITE_AS["REALM_OWNER"]
+INVITE_AS_ROLES_REQUIRING_ADMIN = frozenset(
+    {
+        # Owners can only be invited by owners, checked by separate
+        # logic in check_role_based_permissions.
+        INVITE_AS_REALM_OWNER,
+        PreregistrationUser.INVITE_AS["REALM_ADMIN"],
+        PreregistrationUser.INVITE_AS["MODERATOR"],
+    }
+)
+
 
 def check_role_based_permissions(
     invited_as: int, user_profile: UserProfile, *, require_admin: bool
 ) -> None:
-    if (
-        invited_as == PreregistrationUser.INVITE_AS["REALM_OWNER"]
-        and not user_profile.is_realm_owner
-    ):
+    if invited_as == INVITE_AS_REALM_OWNER and not user_profile.is_realm_owner:
         raise OrganizationOwnerRequiredError
 
     if require_admin and not user_profile.is_realm_admin:
@@ -131,8 +141,8 @@ def invite_users_backend(
     invite_expires_in_minutes: Json[int | None] = INVITATION_LINK_VALIDITY_MINUTES,
     invite_as: Annotated[
         Json[int],
-        check_int_in_validator(list(PreregistrationUser.INVITE_AS.values())),
-    ] = PreregistrationUser.INVITE_AS["MEMBER"],
+        check_int_in_validator(INVITE_AS_VALUES),
+    ] = INVITE_AS_MEMBER,
     notify_referrer_on_join: Json[bool] = True,
     stream_ids: Json[list[int]],
     group_ids: Json[list[int]] | None = None,
@@ -143,13 +153,7 @@ def invite_users_backend(
         # be handled by the decorator above.
         raise JsonableError(_("Insufficient permission"))
 
-    require_admin = invite_as in [
-        # Owners can only be invited by owners, checked by separate
-        # logic in check_role_based_permissions.
-        PreregistrationUser.INVITE_AS["REALM_OWNER"],
-        PreregistrationUser.INVITE_AS["REALM_ADMIN"],
-        PreregistrationUser.INVITE_AS["MODERATOR"],
-    ]
+    require_admin = invite_as in INVITE_AS_ROLES_REQUIRING_ADMIN
     check_role_based_permissions(invite_as, user_profile, require_admin=require_admin)
 
     if not invitee_emails_raw:
@@ -185,15 +189,19 @@ def invite_users_backend(
     return json_success(request)
 
 
+# Matches each comma- or newline-separated entry of a list of
+# invitees; for entries of the form `Name <email>`, the `email` group
+# captures just the part between the first `<` and the last `>`.
+INVITEE_EMAIL_REGEX = re.compile(
+    r"(?<![^,\n])(?:[^,\n<]*<(?P<email>[^,\n]*)>[^,\n>]*|(?P<bare>[^,\n]*))"
+)
+
+
 def get_invitee_emails_set(invitee_emails_raw: str) -> set[str]:
-    invitee_emails_list = set(re.split(r"[,\n]", invitee_emails_raw))
-    invitee_emails = set()
-    for email in invitee_emails_list:
-        is_email_with_name = re.search(r"<(?P<email>.*)>", email)
-        if is_email_with_name:
-            email = is_email_with_name.group("email")
-        invitee_emails.add(email.strip())
-    return invitee_emails
+    return {
+        (match["email"] if match["email"] is not None else match["bare"]).strip()
+        for match in INVITEE_EMAIL_REGEX.finditer(invitee_emails_raw)
+    }
 
 
 @require_member_or_admin
@@ -241,8 +249,8 @@ def generate_multiuse_invite_backend(
     invite_expires_in_minutes: Json[int | None] = INVITATION_LINK_VALIDITY_MINUTES,
     invite_as: Annotated[
         Json[int],
-        check_int_in_validator(list(PreregistrationUser.INVITE_AS.values())),
-    ] = PreregistrationUser.INVITE_AS["MEMBER"],
+        check_int_in_validator(INVITE_AS_VALUES),
+    ] = INVITE_AS_MEMBER,
     stream_ids: Json[list[int]] | None = None,
     group_ids: Json[list[int]] | None = None,
     include_realm_default_subscriptions: Json[bool] = False,
@@ -254,13 +262,7 @@ def generate_multiuse_invite_backend(
         # be handled by the decorator above.
         raise JsonableError(_("Insufficient permission"))
 
-    require_admin = invite_as in [
-        # Owners can only be invited by owners, checked by separate
-        # logic in check_role_based_permissions.
-        PreregistrationUser.INVITE_AS["REALM_OWNER"],
-        PreregistrationUser.INVITE_AS["REALM_ADMIN"],
-        PreregistrationUser.INVITE_AS["MODERATOR"],
-    ]
+    require_admin = invite_as in INVITE_AS_ROLES_REQUIRING_ADMIN
     check_role_based_permissions(invite_as, user_profile, require_admin=require_admin)
 
     streams = access_streams_for_invite(stream_ids, user_profile)
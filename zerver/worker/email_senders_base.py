@@ -1,6 +1,7 @@
 # Documented in https://zulip.readthedocs.io/en/latest/subsystems/queuing.html
 import copy
 import logging
+import smtplib
 import socket
 from collections.abc import Callable
 from functools import wraps
@@ -32,7 +33,12 @@ def retry_send_email_failures(
     def wrapper(worker: ConcreteQueueWorker, data: dict[str, Any]) -> None:
         try:
             func(worker, data)
-        except (socket.gaierror, TimeoutError, EmailNotDeliveredError) as e:
+        except (
+            socket.gaierror,
+            TimeoutError,
+            smtplib.SMTPServerDisconnected,
+            EmailNotDeliveredError,
+        ) as e:
             error_class_name = type(e).__name__
 
             def on_failure(event: dict[str, Any]) -> None:
@@ -54,6 +60,10 @@ class EmailSendingWorker(LoopQueueProcessingWorker):
     ) -> None:
         super().__init__(threaded, disable_timeout, worker_num)
         self.connection: BaseEmailBackend | None = None
+        # Whether self.connection has been used successfully in the
+        # current batch, so that we needn't check it before each email.
+        self.connection_verified = False
+        self.realms_by_id: dict[int, Realm] = {}
 
     @retry_send_email_failures
     def send_email(self, event: dict[str, Any]) -> None:
@@ -66,13 +76,37 @@ class EmailSendingWorker(LoopQueueProcessingWorker):
         handle_send_email_format_changes(copied_event)
         if "realm_id" in copied_event:
             # "realm" does not serialize over the queue, so we send the realm_id
-            copied_event["realm"] = Realm.objects.get(id=copied_event["realm_id"])
-            del copied_event["realm_id"]
-        self.connection = initialize_connection(self.connection)
-        send_immediate_email(**copied_event, connection=self.connection)
+            realm_id = copied_event.pop("realm_id")
+            realm = self.realms_by_id.get(realm_id)
+            if realm is None:
+                # The realm was deleted after the email was queued.
+                raise Realm.DoesNotExist(f"Realm {realm_id} does not exist")
+            copied_event["realm"] = realm
+        if not self.connection_verified:
+            self.connection = initialize_connection(self.connection)
+        self.connection_verified = False
+        try:
+            send_immediate_email(**copied_event, connection=self.connection)
+        except smtplib.SMTPServerDisconnected:
+            # The server may close a connection we have been reusing
+            # (an idle timeout, or a per-connection message limit);
+            # reconnect and send once more.
+            self.connection = initialize_connection(self.connection)
+            send_immediate_email(**copied_event, connection=self.connection)
+        self.connection_verified = True
 
     @override
     def consume_batch(self, events: list[dict[str, Any]]) -> None:
+        # Bulk sends, like invitations, enqueue one event per recipient,
+        # generally all in the same realm; fetch each realm only once
+        # per batch, rather than once per event.
+        self.realms_by_id = Realm.objects.in_bulk(
+            {event["realm_id"] for event in events if event.get("realm_id") is not None}
+        )
+        # Every email in a batch (e.g. a batch of invitations) is sent
+        # over the same SMTP connection; it is checked at the start of
+        # the batch, and again only after a failed send.
+        self.connection_verified = False
         for event in events:
             self.send_email(event)
 